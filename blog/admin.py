@@ -1,8 +1,206 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth.admin import UserAdmin
+from django.contrib.contenttypes.models import ContentType
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.functional import cached_property
 from .models import CustomUser, Article, Comment, Category
-admin.register(CustomUser)
-admin.site.register(Article)
-admin.site.register(Category)
-admin.site.register(Comment)
 
-# Register your models here.
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that reads the planner's row estimate for large unfiltered changelists.
+
+    PostgreSQL keeps an approximate row count in pg_class, so the first
+    changelist page of a big table doesn't need a full COUNT(*). Tables whose
+    estimate is below ``estimate_threshold``, filtered querysets and other
+    database backends fall back to the exact count, so page links stay
+    accurate everywhere except the tables that are slow to count.
+    """
+
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 (or 0) before the table has been analyzed.
+            if row and row[0] > self.estimate_threshold:
+                return row[0]
+        return super().count
+
+
+def _subquery_count(queryset, field):
+    """Count rows in ``queryset`` per outer row without joining the outer query."""
+    counts = (
+        queryset.filter(**{field: OuterRef('pk')})
+        .order_by()
+        .values(field)
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+class BulkActionForm(ActionForm):
+    confirm_delete = forms.BooleanField(required=False, label='Confirm bulk delete')
+
+
+class ArticleActionForm(BulkActionForm):
+    category = forms.ModelChoiceField(
+        queryset=Category.objects.all(), required=False, label='Move to category'
+    )
+
+
+class BulkDeleteMixin:
+    """Delete the selected rows with one queryset delete instead of the
+    per-object confirmation page.
+
+    The action only asks for the "Confirm bulk delete" box to be ticked and
+    records a single summary LogEntry. Cascades still go through Django's
+    collector, so comments, replies and likes under the selected rows are
+    loaded into memory before they are removed.
+    """
+
+    action_form = BulkActionForm
+
+    def get_action_form(self, request):
+        form = self.action_form(request.POST)
+        form.fields['action'].choices = self.get_action_choices(request)
+        return form
+
+    @admin.action(
+        description='Delete selected in bulk (cascades load related comments)',
+        permissions=['delete'],
+    )
+    def bulk_delete(self, request, queryset):
+        opts = queryset.model._meta
+        form = self.get_action_form(request)
+        if not (form.is_valid() and form.cleaned_data['confirm_delete']):
+            self.message_user(
+                request,
+                f'Tick "Confirm bulk delete" to delete {queryset.count()} '
+                f'{opts.verbose_name_plural} and everything under them.',
+                messages.WARNING,
+            )
+            return
+        pks = list(queryset.values_list('pk', flat=True))
+        _, per_model = queryset.delete()
+        LogEntry.objects.create(
+            user_id=request.user.pk,
+            content_type_id=ContentType.objects.get_for_model(queryset.model).pk,
+            object_repr=f'{len(pks)} {opts.verbose_name_plural} (bulk delete)',
+            action_flag=DELETION,
+            change_message=f'Bulk deleted pks: {pks}',
+        )
+        summary = ', '.join(
+            f'{count} {label}' for label, count in per_model.items() if label != opts.label
+        )
+        message = f'Deleted {per_model.get(opts.label, 0)} {opts.verbose_name_plural}.'
+        if summary:
+            message += f' Also removed: {summary}.'
+        self.message_user(request, message, messages.SUCCESS)
+
+
+@admin.register(CustomUser)
+class CustomUserAdmin(UserAdmin):
+    fieldsets = UserAdmin.fieldsets + (
+        ('Profile', {'fields': ('bio', 'profile_picture')}),
+    )
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('name', 'article_count')
+    search_fields = ('name',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _article_count=_subquery_count(Article.objects.all(), 'category')
+        )
+
+    @admin.display(description='Articles', ordering='_article_count')
+    def article_count(self, obj):
+        return obj._article_count
+
+
+@admin.register(Article)
+class ArticleAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ('title', 'author', 'category', 'created_at', 'views', 'like_count', 'comment_count')
+    list_filter = ('category', 'created_at')
+    list_select_related = ('author', 'category')
+    search_fields = ('title',)
+    autocomplete_fields = ('author', 'category')
+    raw_id_fields = ('likes',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    action_form = ArticleActionForm
+    actions = ('bulk_delete', 'move_to_category')
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _like_count=_subquery_count(Article.likes.through.objects.all(), 'article'),
+            _comment_count=_subquery_count(Comment.objects.all(), 'article'),
+        )
+
+    @admin.display(description='Likes', ordering='_like_count')
+    def like_count(self, obj):
+        return obj._like_count
+
+    @admin.display(description='Comments', ordering='_comment_count')
+    def comment_count(self, obj):
+        return obj._comment_count
+
+    @admin.action(description='Move selected articles to category', permissions=['change'])
+    def move_to_category(self, request, queryset):
+        form = self.get_action_form(request)
+        if not form.is_valid():
+            self.message_user(request, 'That category does not exist.', messages.ERROR)
+            return
+        category = form.cleaned_data['category']
+        if category is None:
+            self.message_user(request, 'Choose a category to move the articles to.', messages.WARNING)
+            return
+        updated = queryset.order_by().update(category=category, updated_at=timezone.now())
+        self.message_user(request, f'Moved {updated} articles to "{category}".', messages.SUCCESS)
+
+
+@admin.register(Comment)
+class CommentAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ('__str__', 'author', 'article', 'created_at', 'like_count', 'reply_count')
+    list_filter = ('created_at',)
+    list_select_related = ('author', 'article')
+    search_fields = ('content',)
+    autocomplete_fields = ('author',)
+    raw_id_fields = ('article', 'parent', 'likes')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    actions = ('bulk_delete',)
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            _like_count=_subquery_count(Comment.likes.through.objects.all(), 'comment'),
+            _reply_count=_subquery_count(Comment.objects.all(), 'parent'),
+        )
+
+    @admin.display(description='Likes', ordering='_like_count')
+    def like_count(self, obj):
+        return obj._like_count
+
+    @admin.display(description='Replies', ordering='_reply_count')
+    def reply_count(self, obj):
+        return obj._reply_count
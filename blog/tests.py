@@ -1,3 +1,198 @@
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
-# Create your tests here.
+from .admin import EstimatedCountPaginator
+from .models import Article, Category, Comment, CustomUser
+
+
+class AdminTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = CustomUser.objects.create_superuser('admin', 'admin@example.com', 'pass')
+        cls.news = Category.objects.create(name='News')
+        cls.sport = Category.objects.create(name='Sport')
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def make_article(self, title='Article', category=None):
+        return Article.objects.create(
+            title=title,
+            thumbnail='thumbnails/home.png',
+            content='Body',
+            category=category or self.news,
+            author=self.admin_user,
+        )
+
+    def make_comment(self, article, parent=None):
+        return Comment.objects.create(
+            article=article, author=self.admin_user, parent=parent, content='Hi'
+        )
+
+    def run_action(self, model, action, pks, **extra):
+        url = reverse(f'admin:blog_{model}_changelist')
+        data = {'action': action, '_selected_action': pks, 'index': 0, **extra}
+        return self.client.post(url, data, follow=True)
+
+    def result_list(self, model):
+        response = self.client.get(reverse(f'admin:blog_{model}_changelist'))
+        return {obj.pk: obj for obj in response.context['cl'].result_list}
+
+
+class AnnotatedCountTests(AdminTestCase):
+    def test_article_counts(self):
+        liked = self.make_article('Liked')
+        empty = self.make_article('Empty')
+        reader = CustomUser.objects.create_user('reader', password='pass')
+        liked.likes.add(self.admin_user, reader)
+        parent = self.make_comment(liked)
+        self.make_comment(liked, parent=parent)
+
+        results = self.result_list('article')
+
+        self.assertEqual(results[liked.pk]._like_count, 2)
+        self.assertEqual(results[liked.pk]._comment_count, 2)
+        self.assertEqual(results[empty.pk]._like_count, 0)
+        self.assertEqual(results[empty.pk]._comment_count, 0)
+
+    def test_comment_counts(self):
+        article = self.make_article()
+        parent = self.make_comment(article)
+        self.make_comment(article, parent=parent)
+        self.make_comment(article, parent=parent)
+        lonely = self.make_comment(article)
+        parent.likes.add(self.admin_user)
+
+        results = self.result_list('comment')
+
+        self.assertEqual(results[parent.pk]._like_count, 1)
+        self.assertEqual(results[parent.pk]._reply_count, 2)
+        self.assertEqual(results[lonely.pk]._like_count, 0)
+        self.assertEqual(results[lonely.pk]._reply_count, 0)
+
+
+class MoveToCategoryTests(AdminTestCase):
+    def test_moves_selected_articles(self):
+        moved = self.make_article('Moved')
+        kept = self.make_article('Kept')
+        Article.objects.filter(pk=moved.pk).update(updated_at=timezone.now() - timezone.timedelta(days=1))
+        before = Article.objects.get(pk=moved.pk).updated_at
+
+        self.run_action('article', 'move_to_category', [moved.pk], category=self.sport.pk)
+
+        moved.refresh_from_db()
+        kept.refresh_from_db()
+        self.assertEqual(moved.category, self.sport)
+        self.assertGreater(moved.updated_at, before)
+        self.assertEqual(kept.category, self.news)
+
+    def test_missing_category_is_rejected(self):
+        article = self.make_article()
+
+        response = self.run_action('article', 'move_to_category', [article.pk])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Choose a category')
+        article.refresh_from_db()
+        self.assertEqual(article.category, self.news)
+
+    def test_invalid_category_is_rejected(self):
+        article = self.make_article()
+
+        for value in ('abc', '999999'):
+            response = self.run_action('article', 'move_to_category', [article.pk], category=value)
+            # The changelist validates the action form before dispatching.
+            self.assertContains(response, 'No action selected.')
+        article.refresh_from_db()
+        self.assertEqual(article.category, self.news)
+
+
+class BulkDeleteTests(AdminTestCase):
+    def test_requires_confirmation(self):
+        article = self.make_article()
+
+        response = self.run_action('article', 'bulk_delete', [article.pk])
+
+        self.assertContains(response, 'to delete 1 articles')
+        self.assertTrue(Article.objects.filter(pk=article.pk).exists())
+
+    def test_deletes_only_selected_rows(self):
+        doomed = self.make_article('Doomed')
+        kept = self.make_article('Kept')
+        self.make_comment(doomed)
+        self.make_comment(kept)
+
+        response = self.run_action('article', 'bulk_delete', [doomed.pk], confirm_delete='on')
+
+        self.assertContains(response, 'Deleted 1 articles. Also removed: 1 blog.Comment.')
+        self.assertQuerySetEqual(Article.objects.all(), [kept])
+        self.assertEqual(Comment.objects.get().article, kept)
+        entry = LogEntry.objects.get()
+        self.assertEqual(entry.action_flag, DELETION)
+        self.assertIn(str(doomed.pk), entry.change_message)
+
+    def test_requires_delete_permission(self):
+        staff = CustomUser.objects.create_user('staff', password='pass', is_staff=True)
+        staff.user_permissions.add(
+            Permission.objects.get(codename='view_comment'),
+            Permission.objects.get(codename='change_comment'),
+        )
+        self.client.force_login(staff)
+        comment = self.make_comment(self.make_article())
+
+        self.run_action('comment', 'bulk_delete', [comment.pk], confirm_delete='on')
+
+        self.assertTrue(Comment.objects.filter(pk=comment.pk).exists())
+
+
+class EstimatedCountPaginatorTests(AdminTestCase):
+    def test_exact_count_on_sqlite(self):
+        for i in range(3):
+            self.make_article(f'Article {i}')
+
+        self.assertEqual(EstimatedCountPaginator(Article.objects.order_by('pk'), 2).count, 3)
+
+    def test_exact_count_when_filtered(self):
+        self.make_article('News')
+        self.make_article('Sport', category=self.sport)
+
+        paginator = EstimatedCountPaginator(Article.objects.filter(category=self.sport).order_by('pk'), 2)
+
+        self.assertEqual(paginator.count, 1)
+
+
+class ChangelistQueryCountTests(AdminTestCase):
+    def count_changelist_queries(self, model):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse(f'admin:blog_{model}_changelist'))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx)
+
+    def test_article_changelist(self):
+        self.make_article()
+        expected = self.count_changelist_queries('article')
+        for i in range(10):
+            author = CustomUser.objects.create_user(f'author{i}', is_staff=True)
+            Article.objects.create(
+                title=f'Article {i}', thumbnail='thumbnails/home.png', content='Body',
+                category=Category.objects.create(name=f'Category {i}'), author=author,
+            )
+
+        with self.assertNumQueries(expected):
+            self.client.get(reverse('admin:blog_article_changelist'))
+
+    def test_comment_changelist(self):
+        self.make_comment(self.make_article())
+        expected = self.count_changelist_queries('comment')
+        for i in range(10):
+            article = self.make_article(f'Article {i}')
+            author = CustomUser.objects.create_user(f'author{i}')
+            Comment.objects.create(article=article, author=author, content='Hi')
+
+        with self.assertNumQueries(expected):
+            self.client.get(reverse('admin:blog_comment_changelist'))